@@ -0,0 +1,35 @@
+"""
+Compiled binary models for the belts CLI (--compile / --model); see
+binmodel.py.
+"""
+from array import array
+import binmodel
+from belts_solver import EdgeArrays
+
+def compile_model(inp, fp):
+    """Write `inp` as a compiled binary model (see binmodel.py) to `fp`."""
+    names = binmodel.Names()
+    edges = inp["edges"]
+    if not isinstance(edges, EdgeArrays):
+        edges = EdgeArrays.from_edges(edges)
+    ids = lambda seq: array("q", [names(x) for x in seq])
+    remap = array("q", [names(x) for x in edges.names])
+    sources = inp["sources"]; node_caps = inp.get("node_caps", {})
+    binmodel.dump("belt", names, {
+        "nodes": ids(inp["nodes"]),
+        "sink": ids([inp["sink"]]),
+        "src": array("q", [remap[i] for i in edges.src]),
+        "dst": array("q", [remap[i] for i in edges.dst]),
+        "lo": array("d", edges.lo), "hi": array("d", edges.hi),
+        "src_node": ids(sources), "supply": array("d", [float(v) for v in sources.values()]),
+        "cap_node": ids(node_caps), "cap": array("d", [float(v) for v in node_caps.values()]),
+    }, fp)
+
+def load_model(path):
+    """Load a compiled belts model; edges stay as mmapped array views."""
+    names, v = binmodel.load(path, "belt")
+    return {"nodes": [names[i] for i in v["nodes"]],
+            "edges": EdgeArrays.from_columns(names, v["src"], v["dst"], v["lo"], v["hi"]),
+            "sources": {names[i]: c for i, c in zip(v["src_node"], v["supply"])},
+            "sink": names[v["sink"][0]],
+            "node_caps": {names[i]: c for i, c in zip(v["cap_node"], v["cap"])}}
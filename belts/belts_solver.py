@@ -0,0 +1,254 @@
+"""
+Belts solver: bounded max-flow with lower bounds and node caps (Dinic on
+the circulation transform).
+"""
+import sys, json, math
+from array import array
+from collections import deque, defaultdict
+from cli_common import read_stdin, option
+
+TOL = 1e-9
+
+class Dinic:
+    def __init__(self, n):
+        self.n = n
+        self.head = [-1]*n
+        self.to, self.cap, self.nxt = [], [], []
+        self.level = [0]*n
+        self.it = [0]*n
+
+    def add_edge(self, u, v, c):
+        self.to.append(v); self.cap.append(float(c)); self.nxt.append(self.head[u]); self.head[u] = len(self.to)-1
+        self.to.append(u); self.cap.append(0.0);        self.nxt.append(self.head[v]); self.head[v] = len(self.to)-1
+
+    def bfs(self, s, t):
+        self.level = [-1]*self.n
+        q = deque([s]); self.level[s] = 0
+        while q:
+            u = q.popleft()
+            e = self.head[u]
+            while e != -1:
+                if self.cap[e] > TOL and self.level[self.to[e]] < 0:
+                    self.level[self.to[e]] = self.level[u] + 1
+                    q.append(self.to[e])
+                e = self.nxt[e]
+        return self.level[t] >= 0
+
+    def dfs(self, u, t, f):
+        if u == t: return f
+        e = self.it[u]
+        while e != -1:
+            if self.cap[e] > TOL and self.level[self.to[e]] == self.level[u] + 1:
+                ret = self.dfs(self.to[e], t, min(f, self.cap[e]))
+                if ret > 0:
+                    self.cap[e] -= ret
+                    self.cap[e^1] += ret
+                    return ret
+            self.it[u] = self.nxt[e]
+            e = self.it[u]
+        return 0.0
+
+    def maxflow(self, s, t):
+        flow = 0.0
+        INF = 1e30
+        while self.bfs(s, t):
+            self.it = self.head[:]
+            while True:
+                pushed = self.dfs(s, t, INF)
+                if pushed <= TOL: break
+                flow += pushed
+        return flow
+
+    def reachable_from(self, s):
+        seen = [False]*self.n
+        q = deque([s]); seen[s] = True
+        while q:
+            u = q.popleft()
+            e = self.head[u]
+            while e != -1:
+                if self.cap[e] > TOL and not seen[self.to[e]]:
+                    seen[self.to[e]] = True
+                    q.append(self.to[e])
+                e = self.nxt[e]
+        return seen
+
+class EdgeArrays:
+    """Edge list packed into parallel arrays with interned endpoint names."""
+    __slots__ = ("names", "index", "src", "dst", "lo", "hi")
+
+    def __init__(self):
+        self.names, self.index = [], {}
+        self.src, self.dst = array("l"), array("l")
+        self.lo, self.hi = array("d"), array("d")
+
+    @classmethod
+    def from_edges(cls, edges):
+        ea = cls()
+        for e in edges:
+            ea.append(e["from"], e["to"], e.get("lo", 0.0), e.get("hi", 0.0))
+        return ea
+
+    def intern(self, name):
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names); self.names.append(name)
+        return i
+
+    def append(self, u, v, lo, hi):
+        self.src.append(self.intern(u)); self.dst.append(self.intern(v))
+        self.lo.append(float(lo)); self.hi.append(float(hi))
+
+    def __len__(self):
+        return len(self.src)
+
+    @classmethod
+    def from_columns(cls, names, src, dst, lo, hi):
+        # read-only view over existing columns (e.g. mmapped memoryviews)
+        ea = cls()
+        ea.names, ea.src, ea.dst, ea.lo, ea.hi = names, src, dst, lo, hi
+        return ea
+
+def belts_solve(inp):
+    """Solve `inp` (dict or EdgeArrays-backed model) into the output dict.
+
+    On success "flows" is a one-shot generator, so large maps never hold
+    every entry at once; callers that serialize the dict directly must
+    list() it first (main does) or use write_stream.
+    """
+    nodes = list(inp["nodes"])
+    idx = {name:i for i,name in enumerate(nodes)}
+    sink = inp["sink"]
+    sources = {k: float(v) for k,v in inp["sources"].items()}
+    node_caps = inp.get("node_caps", {})
+    edges = inp["edges"]
+    if not isinstance(edges, EdgeArrays):
+        edges = EdgeArrays.from_edges(edges)
+
+    # a bound with hi < lo (edge, or a negative node cap) is infeasible
+    # outright: answer before building anything
+    if (any(float(cap) < -1e-9 for v, cap in node_caps.items() if v != sink and v not in sources)
+            or any(hi - lo < -1e-9 for lo, hi in zip(edges.lo, edges.hi))):
+        return {"status":"infeasible","cut_reachable":[], "deficit":{"demand_balance":0,"tight_nodes":[],"tight_edges":[]}}
+
+    # node splitting (except sources/sink)
+    split_in, split_out = {}, {}
+    cur_nodes = nodes[:]
+
+    def add_node(name):
+        if name in idx: return idx[name]
+        idx[name] = len(cur_nodes); cur_nodes.append(name); return idx[name]
+
+    for v, cap in node_caps.items():
+        if v == sink or v in sources: continue
+        vin, vout = f"{v}#in", f"{v}#out"
+        add_node(vin); add_node(vout)
+        split_in[v] = idx[vin]; split_out[v] = idx[vout]
+
+    # transformed edges as parallel arrays: t_u, t_v index into idx, t_lo/t_hi bounds
+    t_u, t_v, t_lo, t_hi = array("l"), array("l"), array("d"), array("d")
+    for v, cap in node_caps.items():
+        if v == sink or v in sources: continue
+        t_u.append(idx[f"{v}#in"]); t_v.append(idx[f"{v}#out"])
+        t_lo.append(0.0); t_hi.append(float(cap))
+
+    names = edges.names
+    for k in range(len(edges)):
+        u, v = names[edges.src[k]], names[edges.dst[k]]
+        u2 = f"{u}#out" if u in split_out else u
+        v2 = f"{v}#in"  if v in split_in  else v
+        t_u.append(add_node(u2)); t_v.append(add_node(v2))
+        t_lo.append(edges.lo[k]); t_hi.append(edges.hi[k])
+
+    N = len(idx)
+    Sstar, Tstar = N, N+1
+    g = Dinic(N+2)
+
+    # lower-bound transform; transformed edge k is Dinic edge 2*k
+    demand = [0.0]*N
+    for k in range(len(t_u)):
+        ui, vi, lo = t_u[k], t_v[k], t_lo[k]
+        cap = t_hi[k] - lo
+        g.add_edge(ui, vi, max(0.0, cap))
+        demand[ui] -= lo
+        demand[vi] += lo
+
+    # circulation trick: add infinite sink->source edges
+    sink_node = sink if sink not in split_in else f"{sink}#in"
+    sink_idx = idx[sink_node]
+    for sname, sup in sources.items():
+        s_node = sname if sname not in split_out else f"{sname}#out"
+        s_idx = idx[s_node]
+        g.add_edge(sink_idx, s_idx, 1e30)
+
+    # encode supplies into demand vector
+    total_supply = 0.0
+    for sname, sup in sources.items():
+        s_node = sname if sname not in split_out else f"{sname}#out"
+        s_idx = idx[s_node]
+        demand[s_idx] -= sup
+        total_supply += sup
+    demand[sink_idx] += total_supply
+
+    total_pos = 0.0
+    for i,val in enumerate(demand):
+        if val > 1e-9:
+            g.add_edge(Sstar, i, val)
+            total_pos += val
+        elif val < -1e-9:
+            g.add_edge(i, Tstar, -val)
+
+    flow = g.maxflow(Sstar, Tstar)
+    inv = [None]*N
+    for name, i in idx.items():
+        inv[i] = name
+    if flow + 1e-6 < total_pos:
+        reach = g.reachable_from(Sstar)
+        cut_reach = [name for name, i_ in idx.items() if i_ < N and reach[i_]]
+        tight_edges = []
+        for k in range(len(t_u)):
+            ui, vi = t_u[k], t_v[k]
+            if ui < N and vi < N and reach[ui] and not reach[vi]:
+                if g.cap[2*k] <= 1e-9:
+                    tight_edges.append({"from": inv[ui], "to": inv[vi], "flow_needed": 0})
+        deficit = total_pos - flow
+        return {"status":"infeasible",
+                "cut_reachable": sorted(cut_reach),
+                "deficit":{"demand_balance": deficit, "tight_nodes": [], "tight_edges": tight_edges}}
+
+    # feasible: reconstruct flows = lo + (hi-lo - residual), one entry at a time
+    def flows():
+        for k in range(len(t_u)):
+            lo, hi = t_lo[k], t_hi[k]
+            f = lo + ((hi - lo) - g.cap[2*k])
+            u = inv[t_u[k]]; v = inv[t_v[k]]
+            if u.endswith("#out"): u = u[:-4]
+            if v.endswith("#in"):  v = v[:-3]
+            yield {"from": u, "to": v, "flow": float(max(0.0,f))}
+
+    return {"status":"ok", "max_flow_per_min": sum(sources.values()), "flows": flows()}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    stream = "--stream" in argv
+    if stream:
+        from belts_stream import read_stdin_stream, write_stream
+    if "--compile" in argv:
+        from belts_model import compile_model
+        compile_model(read_stdin_stream() if stream else read_stdin(), sys.stdout.buffer)
+        return
+    model = option(argv, "--model")
+    if model is not None:
+        from belts_model import load_model
+        inp = load_model(model)
+    else:
+        inp = read_stdin_stream() if stream else read_stdin()
+    if stream:
+        write_stream(belts_solve(inp))
+        return
+    out = belts_solve(inp)
+    if "flows" in out:
+        out["flows"] = list(out["flows"])
+    sys.stdout.write(json.dumps(out, separators=(",",":")))
+
+if __name__ == "__main__":
+    main()
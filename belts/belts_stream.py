@@ -0,0 +1,108 @@
+"""
+Incremental JSON input and batched output for the belts CLI (--stream).
+"""
+import sys, json
+from belts_solver import EdgeArrays
+
+CHUNK = 1 << 16
+
+class JsonStream:
+    """Pull parser over a text stream; values are decoded one at a time."""
+
+    def __init__(self, fp, chunk=CHUNK):
+        self.fp, self.chunk = fp, chunk
+        self.buf, self.pos, self.eof = "", 0, False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        if self.eof: return False
+        # grow geometrically so a single large value is not re-decoded quadratically
+        data = self.fp.read(max(self.chunk, len(self.buf) - self.pos))
+        if not data:
+            self.eof = True; return False
+        self.buf = self.buf[self.pos:] + data; self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            n = len(self.buf)
+            while self.pos < n and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < n: return self.buf[self.pos]
+            if not self.fill(): return ""
+
+    def expect(self, ch):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"expected {ch!r} at stream offset, got {got!r}")
+        self.pos += 1
+
+    def more(self, close):
+        # after an element: True if a ',' follows, False if the container closes
+        if self.peek() == ",":
+            self.pos += 1; return True
+        self.expect(close)
+        return False
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                val, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill(): continue
+                raise
+            # a number may continue in the next chunk
+            if end == len(self.buf) and self.fill(): continue
+            self.pos = end
+            return val
+
+def read_stdin_stream(fp=None):
+    """Parse a belts input incrementally; `edges` becomes an EdgeArrays."""
+    s = JsonStream(fp if fp is not None else sys.stdin)
+    inp = {}
+    s.expect("{")
+    if s.peek() == "}":
+        s.expect("}"); return inp
+    while True:
+        key = s.value()
+        s.expect(":")
+        if key == "edges":
+            edges = inp[key] = EdgeArrays()
+            s.expect("[")
+            if s.peek() == "]":
+                s.expect("]")
+            else:
+                while True:
+                    e = s.value()
+                    edges.append(e["from"], e["to"], e.get("lo", 0.0), e.get("hi", 0.0))
+                    if not s.more("]"): break
+        else:
+            inp[key] = s.value()
+        if not s.more("}"): break
+    return inp
+
+STREAM_BATCH = 4096  # flow entries per write
+
+def write_stream(out, fp=None):
+    """Write `out` as compact JSON, emitting `flows` in batches of entries."""
+    fp = fp if fp is not None else sys.stdout
+    encode = json.JSONEncoder(separators=(",",":")).encode
+    fp.write("{")
+    for n, (key, val) in enumerate(out.items()):
+        if n: fp.write(",")
+        fp.write(encode(key) + ":")
+        if key != "flows":
+            fp.write(encode(val)); continue
+        fp.write("[")
+        sep = ""
+        batch = []
+        for e in val:
+            batch.append(e)
+            if len(batch) == STREAM_BATCH:
+                # one encode per batch; drop the list's own brackets
+                fp.write(sep + encode(batch)[1:-1]); sep = ","; batch = []
+        if batch:
+            fp.write(sep + encode(batch)[1:-1])
+        fp.write("]")
+    fp.write("}")
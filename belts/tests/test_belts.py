@@ -3,11 +3,13 @@ import json, subprocess, os, pathlib
 BELT_CMD = os.environ.get("BELTS_CMD", "python belts/main.py")
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 
-def run_case(payload):
-    p = subprocess.run(BELT_CMD.split(), input=json.dumps(payload).encode(),
+def run_case(payload, flags=(), raw=False):
+    # payload None sends no input (--model); raw returns the undecoded bytes
+    data = b"" if payload is None else json.dumps(payload).encode()
+    p = subprocess.run(BELT_CMD.split() + list(flags), input=data,
                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=str(ROOT))
     assert p.returncode == 0, p.stderr.decode()
-    return json.loads(p.stdout.decode())
+    return p.stdout if raw else json.loads(p.stdout.decode())
 
 def test_basic_feasible():
     payload = {
@@ -42,3 +44,33 @@ def test_infeasible():
     out = run_case(payload)
     assert out["status"] == "infeasible"
     assert "cut_reachable" in out
+
+def test_stream_matches_default():
+    payload = {
+        "sink": "sink",
+        "edges": [
+            {"from":"s1","to":"a","lo":0,"hi":900},
+            {"from":"a","to":"b","lo":100,"hi":900},
+            {"from":"b","to":"sink","lo":0,"hi":900}
+        ],
+        "nodes": ["s1","a","b","sink"],
+        "sources": {"s1":500},
+        "node_caps": {"a": 2000}
+    }
+    assert run_case(payload, ["--stream"]) == run_case(payload)
+
+def test_compiled_model_matches_json(tmp_path):
+    payload = {
+        "nodes": ["s1","a","b","sink"],
+        "edges": [
+            {"from":"s1","to":"a","lo":0,"hi":900},
+            {"from":"a","to":"b","lo":0,"hi":400},
+            {"from":"b","to":"sink","lo":0,"hi":900}
+        ],
+        "sources": {"s1":300},
+        "sink": "sink",
+        "node_caps": {"b": 350}
+    }
+    model = tmp_path / "belts.bin"
+    model.write_bytes(run_case(payload, ["--compile"], raw=True))
+    assert run_case(None, ["--model", str(model)]) == run_case(payload)
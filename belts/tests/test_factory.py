@@ -1,13 +1,15 @@
-import json, subprocess, os, pathlib
+import json, math, random, subprocess, os, pathlib, sys
 
 FACT_CMD = os.environ.get("FACTORY_CMD", "python factory/main.py")
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 
-def run_case(payload):
-    p = subprocess.run(FACT_CMD.split(), input=json.dumps(payload).encode(),
+def run_case(payload, flags=(), raw=False):
+    # payload None sends no input (--model); raw returns the undecoded bytes
+    data = b"" if payload is None else json.dumps(payload).encode()
+    p = subprocess.run(FACT_CMD.split() + list(flags), input=data,
                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=str(ROOT))
     assert p.returncode == 0, p.stderr.decode()
-    return json.loads(p.stdout.decode())
+    return p.stdout if raw else json.loads(p.stdout.decode())
 
 def test_sample():
     payload = {
@@ -24,6 +26,165 @@ def test_sample():
     out = run_case(payload)
     assert out["status"] in ("ok","infeasible")
     if out["status"] == "ok":
-        assert abs(out["per_recipe_crafts_per_min"]["green_circuit"] - 1800) < 1e-6
+        # productivity (+10% on assembler_1) scales outputs, not crafts
+        assert abs(out["per_recipe_crafts_per_min"]["green_circuit"] * 1.1 - 1800) < 1e-6
         for v in out["raw_consumption_per_min"].values():
             assert v >= -1e-6
+
+def test_compiled_model_matches_json(tmp_path):
+    payload = {
+      "machines": {"assembler_1":{"crafts_per_min":30},"chemical":{"crafts_per_min":60}},
+      "recipes": {
+        "iron_plate":{"machine":"chemical","time_s":3.2,"in":{"iron_ore":1},"out":{"iron_plate":1}},
+        "gear":{"machine":"assembler_1","time_s":0.5,"in":{"iron_plate":2},"out":{"gear":1}}
+      },
+      "modules": {"chemical":{"prod":0.2}},
+      "limits": {"raw_supply_per_min":{"iron_ore":500},"max_machines":{"assembler_1":10}},
+      "target": {"item":"gear","rate_per_min":120}
+    }
+    model = tmp_path / "factory.bin"
+    model.write_bytes(run_case(payload, ["--compile"], raw=True))
+    assert run_case(None, ["--model", str(model)]) == run_case(payload)
+
+def test_sensitivity_report():
+    payload = {
+      "machines": {"chemical":{"crafts_per_min":60}},
+      "recipes": {"iron_plate":{"machine":"chemical","time_s":1,"in":{"iron_ore":2},"out":{"iron_plate":1}},
+                  "dirty_plate":{"machine":"chemical","time_s":1,"in":{"iron_ore":8},"out":{"iron_plate":1}}},
+      "limits": {"raw_supply_per_min":{"iron_ore":300},"max_machines":{"chemical":1}},
+      "target": {"item":"iron_plate","rate_per_min":600}
+    }
+    out = run_case(payload, ["--sensitivity"])
+    assert out["status"] == "infeasible"
+    assert abs(out["max_feasible_target_per_min"] - 150) < 1e-6
+    ore = out["sensitivity"]["raw_supply"]["iron_ore"]
+    assert abs(ore["shadow_price"] - 0.5) < 1e-9
+    # ore stops binding once the one machine (3600 crafts/min) needs 7200 ore
+    assert abs(ore["allowable_increase"] - 6900) < 1e-6
+    assert abs(ore["allowable_decrease"] - 300) < 1e-6
+    assert out["sensitivity"]["max_machines"]["chemical"]["shadow_price"] == 0.0
+    # one dirty craft/min burns 8 ore that would make 4 plates: a loss of 3
+    costs = out["sensitivity"]["recipe_reduced_costs"]
+    assert abs(costs["dirty_plate"] - 3.0) < 1e-9
+    assert costs["iron_plate"] == 0.0
+    assert "sensitivity" not in run_case(payload)
+
+def test_integer_machine_counts():
+    payload = {
+      "machines": {"assembler_1":{"crafts_per_min":30},"chemical":{"crafts_per_min":60}},
+      "recipes": {
+        "iron_plate":{"machine":"chemical","time_s":3.2,"in":{"iron_ore":1},"out":{"iron_plate":1}},
+        "copper_plate":{"machine":"chemical","time_s":3.2,"in":{"copper_ore":1},"out":{"copper_plate":1}},
+        "green_circuit":{"machine":"assembler_1","time_s":0.5,"in":{"iron_plate":1,"copper_plate":3},"out":{"green_circuit":1}}
+      },
+      "modules": {"assembler_1":{"prod":0.1,"speed":0.15},"chemical":{"prod":0.2,"speed":0.1}},
+      "limits": {"raw_supply_per_min":{"iron_ore":5000,"copper_ore":5000},"max_machines":{"assembler_1":300,"chemical":300}},
+      "target": {"item":"green_circuit","rate_per_min":1800}
+    }
+    # 4.09 copper + 1.36 iron chemical plants, 0.40 assemblers
+    out = run_case(payload, ["--integer", "--integer-mode", "recipe"])
+    assert out["status"] == "ok"
+    assert out["integer"]["per_recipe_machines"] == {"copper_plate": 4, "green_circuit": 1, "iron_plate": 2}
+    assert out["per_machine_counts"] == {"assembler_1": 1, "chemical": 6}
+    assert out["integer"]["search"] == "optimal" and out["integer"]["gap"] == 0.0
+    # pooling recipes on one machine type saves a chemical plant
+    out = run_case(payload, ["--integer", "--integer-mode", "machine"])
+    assert out["per_machine_counts"] == {"assembler_1": 1, "chemical": 5}
+    assert out["integer"]["total_machines"] == 6
+
+def test_bulk_run_matches_cli(tmp_path):
+    base = {
+      "machines": {"chemical":{"crafts_per_min":60}},
+      "recipes": {"iron_plate":{"machine":"chemical","time_s":1,"in":{"iron_ore":2},"out":{"iron_plate":1}}},
+      "limits": {"raw_supply_per_min":{"iron_ore":3000},"max_machines":{"chemical":2}},
+      "target": {"item":"iron_plate","rate_per_min":600}
+    }
+    payloads = []
+    for prod in (0, 0.1, 0.2, 0.3, 0.4):
+        p = json.loads(json.dumps(base))
+        p["modules"] = {"chemical":{"prod":prod}}
+        payloads.append(p)
+    inputs = tmp_path / "loadouts.jsonl"
+    inputs.write_text("".join(json.dumps(p) + "\n" for p in payloads))
+    q = subprocess.run([sys.executable, str(ROOT.parent / "bulk_run.py"), "factory", str(inputs), "--workers", "2", "--chunk", "1"],
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=str(ROOT))
+    assert q.returncode == 0, q.stderr.decode()
+    lines = q.stdout.decode().splitlines()
+    assert [json.loads(l) for l in lines] == [run_case(p) for p in payloads]  # input order
+    report = json.loads(q.stderr.decode())
+    assert report["inputs"] == 5 and report["errors"] == 0
+    assert set(report["latency_ms"]) == {"p50", "p90", "p99", "max"}
+
+def test_integer_long_chain():
+    # 160 recipes in a chain: each crafts exactly target/a per minute, so
+    # the whole-machine optimum is known in closed form
+    cpm = {"m0": 30, "m1": 45, "m2": 60, "m3": 75}
+    times = [0.5, 1, 2, 3.2, 5]
+    rate = 50003
+    recipes, expect = {}, {}
+    for k in range(160):
+        a, m, t = 1 + k % 4, f"m{k % 4 if k % 3 else (k // 3) % 4}", times[k % 5]
+        name = f"r{k:03d}"
+        recipes[name] = {"machine": m, "time_s": t, "in": {f"i{k}": a}, "out": {f"i{k+1}": a}}
+        expect[name] = (rate / a) / (cpm[m] * 60.0 / t)   # machines busy
+    payload = {
+      "machines": {m: {"crafts_per_min": v} for m, v in cpm.items()},
+      "recipes": recipes,
+      "limits": {"raw_supply_per_min": {"i0": 1e7}, "max_machines": {m: 100000 for m in cpm}},
+      "target": {"item": "i160", "rate_per_min": rate}
+    }
+    for mode in ("recipe", "machine"):
+        out = run_case(payload, ["--integer", "--integer-mode", mode, "--time-limit", "10"])
+        assert out["status"] == "ok" and out["integer"]["search"] == "optimal", out.get("integer")
+        if mode == "recipe":
+            assert out["integer"]["per_recipe_machines"] == {r: math.ceil(z) for r, z in expect.items()}
+        else:
+            busy = {m: sum(z for r, z in expect.items() if recipes[r]["machine"] == m) for m in cpm}
+            assert out["per_machine_counts"] == {m: math.ceil(z) for m, z in busy.items()}
+
+def deep_book(seed, rate):
+    # 250 recipes, each making i_k from 1-3 of raw0..raw7 / i_{k-20}..i_{k-1};
+    # quantities compound along the chain, so the LP basis is ill-conditioned
+    r = random.Random(seed)
+    recipes = {}
+    for k in range(250):
+        pool = [f"raw{j}" for j in range(8)] + [f"i{j}" for j in range(max(0, k-20), k)]
+        ins = {x: r.randint(1, 4) for x in r.sample(pool, r.randint(1, 3))}
+        recipes[f"r{k:03d}"] = {"machine": f"m{r.randrange(4)}", "time_s": r.choice([0.5, 1, 2, 3.2]),
+                               "in": ins, "out": {f"i{k}": r.randint(1, 3)}}
+    recipes["final"] = {"machine": "m0", "time_s": 1, "in": {f"i{k}": 1 for k in range(245, 250)}, "out": {"goal": 1}}
+    return {
+      "machines": {f"m{k}": {"crafts_per_min": v} for k, v in enumerate((30, 45, 60, 75))},
+      "recipes": recipes,
+      "limits": {"raw_supply_per_min": {f"raw{j}": 1e9 for j in range(8)}, "max_machines": {f"m{k}": 1e6 for k in range(4)}},
+      "target": {"item": "goal", "rate_per_min": rate}
+    }
+
+def test_deep_book_max_rate():
+    # one recipe per item and no cycles: push demand for one goal/min back
+    # to raw use and machine time, and the tightest cap gives the max rate
+    payload = deep_book(8, 60)
+    demand, use = {"goal": 1.0}, {}
+    for name in ["final"] + [f"r{k:03d}" for k in reversed(range(250))]:
+        r = payload["recipes"][name]
+        (item, qty), = r["out"].items()
+        crafts = demand.get(item, 0.0) / qty
+        m = r["machine"]
+        use[m] = use.get(m, 0.0) + crafts * r["time_s"] / (payload["machines"][m]["crafts_per_min"] * 60.0)
+        for x, q in r["in"].items():
+            (demand if x.startswith("i") else use)[x] = (demand if x.startswith("i") else use).get(x, 0.0) + crafts * q
+    caps = dict(payload["limits"]["raw_supply_per_min"], **payload["limits"]["max_machines"])
+    best = min(caps[k] / v for k, v in use.items() if v)
+    assert 60 < best < 1000
+    out = run_case(payload)
+    assert out["status"] == "ok" and abs(out["per_recipe_crafts_per_min"]["final"] - 60) < 1e-6
+    out = run_case(deep_book(8, 1000))
+    assert out["status"] == "infeasible"
+    assert abs(out["max_feasible_target_per_min"] - best) < 1e-6 * best
+
+def test_integer_search_limit():
+    # stopped before any whole-machine plan: not a proof of infeasibility
+    out = run_case(deep_book(8, 60), ["--integer", "--time-limit", "0.001"])
+    assert out["status"] == "limit" and out["max_feasible_target_per_min"] is None
+    assert out["bottleneck_hint"] == ["integer search limit"]
+    assert out["integer"]["search"] == "no_solution"
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Startup-cost benchmark for the CLI entry points.
+
+For each entry point, runs a tiny payload under `python -X importtime` and
+reports the import cost beyond a bare interpreter (`python -c pass`), the
+heaviest top-level imports, the median wall time over several runs, and the
+time to compile the script itself (a __main__ script is never cached as .pyc).
+Bytecode writing is forced on and every entry point is warmed once, so the
+cached path is timed.
+
+Usage: python bench_startup.py [runs] [--budget-us N]
+Exits 1 if any entry point's import cost exceeds the budget.
+"""
+import json, os, pathlib, statistics, subprocess, sys, time
+
+ROOT = pathlib.Path(__file__).resolve().parent
+
+FACTORY_TINY = {
+    "machines": {"m": {"crafts_per_min": 60}},
+    "recipes": {"r": {"machine": "m", "time_s": 1, "in": {"ore": 1}, "out": {"plate": 1}}},
+    "limits": {"raw_supply_per_min": {"ore": 10}},
+    "target": {"item": "plate", "rate_per_min": 60},
+}
+BELTS_TINY = {
+    "nodes": ["s", "t"], "edges": [{"from": "s", "to": "t", "lo": 0, "hi": 10}],
+    "sources": {"s": 5}, "sink": "t", "node_caps": {},
+}
+FACTORY_UNREACHABLE = dict(FACTORY_TINY, target={"item": "gear", "rate_per_min": 60})
+ENTRY_POINTS = [
+    ("factory", ["factory/main.py"], FACTORY_TINY),
+    ("factory infeasible", ["factory/main.py"], FACTORY_UNREACHABLE),
+    ("belts", ["belts/main.py"], BELTS_TINY),
+    ("belts --stream", ["belts/main.py", "--stream"], BELTS_TINY),
+]
+
+def env():
+    e = dict(os.environ)
+    e.pop("PYTHONDONTWRITEBYTECODE", None)
+    e["PYTHONPATH"] = os.pathsep.join([str(ROOT)] + ([e["PYTHONPATH"]] if e.get("PYTHONPATH") else []))
+    return e
+
+def run(args, payload):
+    t0 = time.perf_counter()
+    p = subprocess.run([sys.executable] + args, input=json.dumps(payload).encode(),
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=str(ROOT), env=env())
+    return time.perf_counter() - t0, p
+
+def top_level_imports(stderr):
+    # "import time: self | cumulative | name"; nested imports are indented
+    out = {}
+    for line in stderr.decode().splitlines():
+        if not line.startswith("import time:"): continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit(): continue
+        name = parts[2].rstrip()
+        if name.startswith(" " * 2) or not name.strip(): continue
+        out[name.strip()] = int(parts[1])
+    return out
+
+def compile_ms(path, runs):
+    src = (ROOT / path).read_text()
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        compile(src, path, "exec")
+    return (time.perf_counter() - t0) / runs * 1e3
+
+def measure(args, payload, runs):
+    run(args, payload)  # warm the .pyc cache
+    _, p = run(["-X", "importtime"] + args, payload)
+    if p.returncode != 0:
+        raise SystemExit(f"{' '.join(args)} failed:\n{p.stderr.decode()}")
+    imports = top_level_imports(p.stderr)
+    walls = [run(args, payload)[0] for _ in range(runs)]
+    return imports, statistics.median(walls)
+
+def main():
+    argv = sys.argv[1:]
+    budget = None
+    if "--budget-us" in argv:
+        i = argv.index("--budget-us"); budget = int(argv[i+1]); del argv[i:i+2]
+    runs = int(argv[0]) if argv else 10
+
+    base_imports, base_wall = measure(["-c", "pass"], {}, runs)
+    report = {"python": sys.version.split()[0], "runs": runs,
+              "baseline": {"import_us": sum(base_imports.values()), "wall_ms": round(base_wall*1e3, 2)},
+              "entry_points": {}}
+    over = []
+    for name, args, payload in ENTRY_POINTS:
+        imports, wall = measure(args, payload, runs)
+        extra = {k: v for k, v in imports.items() if k not in base_imports}
+        import_us = sum(extra.values())
+        report["entry_points"][name] = {
+            "import_us": import_us,
+            "wall_ms": round(wall*1e3, 2),
+            "compile_ms": round(compile_ms(args[0], runs), 2),
+            "top_imports_us": dict(sorted(extra.items(), key=lambda kv: -kv[1])[:5]),
+        }
+        if budget is not None and import_us > budget:
+            over.append(name)
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    if over:
+        sys.stderr.write(f"import budget {budget}us exceeded by: {', '.join(over)}\n")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
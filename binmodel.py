@@ -0,0 +1,82 @@
+"""
+Compact binary container for compiled factory/belts inputs.
+
+Layout (little-endian, every section 8-byte aligned):
+  header   magic "FBM1", kind (4 bytes), version, section count
+  table    per section: name (8 bytes), typecode, offset, element count
+  data     raw array bytes; "names" is a UTF-8 blob indexed by "name_off"
+
+Typecodes are array/memoryview codes: "q" int64, "d" float64, "B" bytes.
+Loading mmaps the file and returns memoryview casts over it (zero copy);
+only the interned name table is decoded into Python strings.
+"""
+import mmap, struct, sys
+from array import array
+
+MAGIC = b"FBM1"
+VERSION = 2  # 2: factory recipes stored in sorted-name (LP column) order
+HEADER = struct.Struct("<4s4sII")
+SECTION = struct.Struct("<8sc7xQQ")
+ITEMSIZE = {"q": 8, "d": 8, "B": 1}
+
+class Names:
+    """Interned string table; ids are positions in `names`."""
+    __slots__ = ("names", "index")
+
+    def __init__(self):
+        self.names, self.index = [], {}
+
+    def __call__(self, name):
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names); self.names.append(name)
+        return i
+
+def _pad(n):
+    return (-n) % 8
+
+def dump(kind, names, sections, fp):
+    """Write `sections` ({name: array}) plus the name table to binary `fp`."""
+    if sys.byteorder != "little":
+        raise ValueError("binary models are little-endian only")
+    blob = bytearray(); off = array("q", [0])
+    for s in names.names:
+        blob += s.encode("utf-8"); off.append(len(blob))
+    items = [("names", array("B", blob)), ("name_off", off)] + list(sections.items())
+
+    pos = HEADER.size + SECTION.size * len(items)
+    pos += _pad(pos)
+    table, chunks = [], []
+    for name, arr in items:
+        data = arr.tobytes()
+        table.append(SECTION.pack(name.encode("ascii"), arr.typecode.encode("ascii"), pos, len(arr)))
+        chunks.append(data + b"\0" * _pad(len(data)))
+        pos += len(chunks[-1])
+
+    head = HEADER.pack(MAGIC, kind.encode("ascii"), VERSION, len(items)) + b"".join(table)
+    fp.write(head + b"\0" * _pad(len(head)))
+    for c in chunks:
+        fp.write(c)
+
+def load(path, kind):
+    """mmap a compiled model; returns (names list, {section: memoryview})."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, k, version, nsec = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a compiled model (version {VERSION}); recompile it with --compile")
+    if k.decode("ascii") != kind:
+        raise ValueError(f"{path}: compiled for {k.decode('ascii')!r}, expected {kind!r}")
+    if sys.byteorder != "little":
+        raise ValueError("binary models are little-endian only")
+
+    buf = memoryview(mm)
+    views = {}
+    for i in range(nsec):
+        name, code, off, count = SECTION.unpack_from(mm, HEADER.size + i*SECTION.size)
+        code = code.decode("ascii")
+        views[name.rstrip(b"\0").decode("ascii")] = buf[off:off + count*ITEMSIZE[code]].cast(code)
+
+    blob, off = views.pop("names"), views.pop("name_off")
+    names = [str(blob[off[i]:off[i+1]], "utf-8") for i in range(len(off) - 1)]
+    return names, views
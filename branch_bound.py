@@ -0,0 +1,132 @@
+"""
+Branch-and-bound on top of lp_solver for mixed-integer LPs.
+min c^T x  s.t.  A_eq x = b_eq,  A_ub x <= b_ub,  x >= 0,  plus integrality:
+each entry of `integer` is either a column j (x_j integer) or a pair
+(coefs, pad) meaning sum(coefs[j] * x_j) is integer, where raising column
+`pad` (coefficient 1, otherwise free to grow) rounds it up. Expressions let
+a count ride on the continuous columns instead of adding a column and a
+linking row per count.
+
+Best-bound node selection; branching on the most fractional entry adds one
+bound row, and each child LP is warm-started from its parent's final
+tableau (resolve_with_bound, dual simplex). Every node also tries rounding
+the integer entries up, which is how incumbents are usually found for
+covering-style models such as machine counts. The search stops at
+node_limit LPs or time_limit seconds; the deadline also reaches into each
+LP, so one slow solve cannot overrun it.
+
+Returns a dict:
+  status      "optimal", "limit" (stopped with an incumbent), "infeasible",
+              "unbounded" or "no_solution" (stopped without an incumbent)
+  x, obj      best integer solution (None if none)
+  best_bound  lower bound on the optimal objective (None if the root LP
+              did not finish)
+  gap         (obj - best_bound) / max(1, |obj|), 0.0 when proven optimal
+  nodes       LPs solved
+"""
+import heapq, math, time
+from lp_solver import simplex_solve, resolve_with_bound
+
+INT_TOL = 1e-6
+
+def _feasible(x, A_eq, b_eq, A_ub, b_ub, tol=INT_TOL):
+    # tolerance relative to the row's terms (balance rows have b = 0 but
+    # terms in the thousands), at the level a count counts as integral
+    for a, b in zip(A_eq, b_eq):
+        terms = [v*x[j] for j, v in enumerate(a) if v]
+        if abs(sum(terms) - b) > tol * max(1.0, abs(b), sum(map(abs, terms))):
+            return False
+    for a, b in zip(A_ub, b_ub):
+        terms = [v*x[j] for j, v in enumerate(a) if v]
+        if sum(terms) > b + tol * max(1.0, abs(b), sum(map(abs, terms))):
+            return False
+    return True
+
+def branch_and_bound(c, A_eq, b_eq, A_ub, b_ub, integer, node_limit=10000, time_limit=10.0):
+    deadline = time.perf_counter() + time_limit
+    # normalize to (coefs, pad); a plain column rounds up through itself
+    exprs = [({e: 1.0}, e) if isinstance(e, int) else e for e in integer]
+    value = lambda x, coefs: sum(v*x[j] for j, v in coefs.items())
+    # an objective that is an integer combination of the integer entries is
+    # integer itself, so LP bounds round up (the weights are the pads' costs)
+    acc = [0.0]*len(c)
+    for coefs, pad in exprs:
+        for j, v in coefs.items():
+            acc[j] += c[pad]*v
+    integral = (all(float(c[pad]).is_integer() for _, pad in exprs)
+                and all(abs(cj - aj) <= 1e-12 for cj, aj in zip(c, acc)))
+    tighten = (lambda b: math.ceil(b - INT_TOL)) if integral else (lambda b: b)
+
+    def result(status, best, bound, nodes):
+        x, obj = best if best is not None else (None, None)
+        if integral:  # c.x of an integer solution, up to rounding
+            obj = None if obj is None else float(round(obj))
+            bound = None if bound is None else float(round(bound))
+        if obj is None:
+            gap = None
+        elif status == "optimal":
+            gap = 0.0
+        else:
+            gap = max(0.0, (obj - bound) / max(1.0, abs(obj)))
+        return {"status": status, "x": x, "obj": obj, "best_bound": bound, "gap": gap, "nodes": nodes}
+
+    status, x, obj, st = simplex_solve(c, A_eq, b_eq, A_ub, b_ub, deadline=deadline)
+    nodes = 1
+    if status == "limit":
+        return result("no_solution", None, None, nodes)
+    if status != "optimal":
+        return result(status, None, None, nodes)
+
+    best = None  # (x, obj)
+    heap = []
+    seq = 0
+
+    def rounded(x, up):
+        xr = x[:]
+        for coefs, pad in exprs:
+            v = value(x, coefs)
+            xr[pad] += (math.ceil(v - INT_TOL) if up else round(v)) - v
+        return xr
+
+    def consider(x, obj, st):
+        nonlocal best, seq
+        frac = None
+        for k, (coefs, _) in enumerate(exprs):
+            v = value(x, coefs)
+            f = v - math.floor(v)
+            if INT_TOL < f < 1 - INT_TOL:
+                # most fractional; ties keep the first entry
+                if frac is None or abs(f - 0.5) < abs(frac[1] - 0.5) - 1e-12:
+                    frac = (k, f, v)
+        if frac is None:
+            xi = rounded(x, False)
+            if best is None or obj < best[1] - 1e-9:
+                best = (xi, sum(cj*v for cj, v in zip(c, xi)))
+            return
+        # rounding heuristic: integer entries up, the rest unchanged
+        xr = rounded(x, True)
+        if _feasible(xr, A_eq, b_eq, A_ub, b_ub):
+            val = sum(cj*v for cj, v in zip(c, xr))
+            if best is None or val < best[1] - 1e-9:
+                best = (xr, val)
+        heapq.heappush(heap, (tighten(obj), seq, frac[0], frac[2], st))
+        seq += 1
+
+    consider(x, obj, st)
+    while heap:
+        bound = heap[0][0]
+        if best is not None and bound >= best[1] - 1e-9:
+            return result("optimal", best, best[1], nodes)
+        if nodes >= node_limit or time.perf_counter() > deadline:
+            return result("limit" if best is not None else "no_solution", best, bound, nodes)
+        _, _, k, v, st = heapq.heappop(heap)
+        for lo, hi in ((None, math.floor(v)), (math.ceil(v), None)):
+            status, x, obj, child = resolve_with_bound(st, exprs[k][0], lo=lo, hi=hi, deadline=deadline)
+            nodes += 1
+            if status == "limit":
+                return result("limit" if best is not None else "no_solution", best, bound, nodes)
+            if status == "optimal" and (best is None or tighten(obj) < best[1] - 1e-9):
+                consider(x, obj, child)
+    if best is None:
+        return result("infeasible", None, None, nodes)
+    return result("optimal", best, best[1], nodes)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Bulk what-if runner: solve many factory or belts inputs across a process pool.
+
+Inputs are a directory (every *.json file, sorted by name) or a JSONL file
+(one input per non-blank line). Each worker imports its tool's solver once
+(initializer) and then solves inputs in-process, so no interpreter is
+started per input. Results stream to stdout in input order, one JSON line
+per input holding exactly what the CLI would print; an input that raises
+gives {"status":"error",...} instead of stopping the run. A throughput and
+per-item latency report (solve time inside the worker) goes to stderr.
+
+Usage: python bulk_run.py factory|belts INPUTS [--workers N] [--chunk N] [tool flags]
+e.g.   python bulk_run.py factory loadouts.jsonl --workers 8 --integer
+"""
+import json, os, pathlib, sys, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = pathlib.Path(__file__).resolve().parent
+
+# tool -> solve(<tool>_solver module, inp, flags) -> output dict; the
+# module (and its mode modules) is imported from the tool's directory
+TOOLS = {
+    "factory": lambda m, inp, flags: m.factory_solve(m.RecipeGraph.from_input(inp), flags),
+    "belts": lambda m, inp, flags: m.belts_solve(inp),
+}
+PRELOAD = {"factory": ["lp_solver", "factory_integer", "factory_sensitivity"], "belts": []}
+
+_worker = None  # (module, solve, flags), set once per worker process
+
+def _init(tool, flags):
+    global _worker
+    import importlib
+    for path in (str(ROOT), str(ROOT / tool)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    mod = importlib.import_module(f"{tool}_solver")
+    for name in PRELOAD[tool]:  # the tools import these lazily
+        importlib.import_module(name)
+    _worker = (mod, TOOLS[tool], flags)
+
+def _solve_chunk(texts):
+    mod, solve, flags = _worker
+    done = []
+    for text in texts:
+        t0 = time.perf_counter()
+        try:
+            out = solve(mod, json.loads(text), flags)
+            if "flows" in out:
+                out["flows"] = list(out["flows"])
+            line = json.dumps(out, separators=(",",":"))
+        except Exception as e:
+            line = json.dumps({"status":"error","error":f"{type(e).__name__}: {e}"}, separators=(",",":"))
+        done.append((line, time.perf_counter() - t0))
+    return done
+
+def read_inputs(path):
+    """Yield raw JSON texts from a directory of *.json files or a JSONL file."""
+    path = pathlib.Path(path)
+    if path.is_dir():
+        for f in sorted(path.glob("*.json")):
+            yield f.read_text()
+        return
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+def chunks(texts, n):
+    buf = []
+    for t in texts:
+        buf.append(t)
+        if len(buf) == n:
+            yield buf; buf = []
+    if buf:
+        yield buf
+
+def run(tool, texts, flags=(), workers=None, chunk=4):
+    """Yield (output line, solve seconds) per input, in input order.
+
+    At most a few chunks per worker are in flight, so inputs are read
+    lazily and results start streaming before the last input is read.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init, initargs=(tool, list(flags))) as ex:
+        pending = deque()
+        for c in chunks(texts, chunk):
+            pending.append(ex.submit(_solve_chunk, c))
+            if len(pending) >= 4*workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def percentile(sorted_vals, p):
+    # nearest rank
+    if not sorted_vals: return None
+    k = max(0, min(len(sorted_vals) - 1, -(-p*len(sorted_vals)//100) - 1))
+    return sorted_vals[int(k)]
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    opts = {}
+    for flag in ("--workers", "--chunk"):
+        if flag in argv:
+            i = argv.index(flag); opts[flag] = int(argv[i+1]); del argv[i:i+2]
+    if len(argv) < 2 or argv[0] not in TOOLS:
+        raise SystemExit("usage: python bulk_run.py factory|belts INPUTS [--workers N] [--chunk N] [tool flags]")
+    tool, path, flags = argv[0], argv[1], argv[2:]
+    workers = opts.get("--workers") or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    lat = []
+    errors = 0
+    out = sys.stdout
+    for line, dt in run(tool, read_inputs(path), flags, workers, opts.get("--chunk", 4)):
+        out.write(line + "\n")
+        lat.append(dt)
+        errors += line.startswith('{"status":"error"')
+    wall = time.perf_counter() - t0
+    lat.sort()
+    ms = lambda v: None if v is None else round(v*1e3, 3)
+    report = {"tool": tool, "inputs": len(lat), "errors": errors, "workers": workers,
+              "wall_s": round(wall, 3), "solves_per_s": round(len(lat)/wall, 1) if wall > 0 else None,
+              "latency_ms": {"p50": ms(percentile(lat, 50)), "p90": ms(percentile(lat, 90)),
+                             "p99": ms(percentile(lat, 99)), "max": ms(lat[-1] if lat else None)}}
+    sys.stderr.write(json.dumps(report) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Helpers shared by the factory and belts CLIs.
+
+Each tool's main.py only imports <tool>_solver.py: a __main__ script is
+recompiled on every run, an imported module's bytecode is cached. Code for
+an optional mode (--integer, --sensitivity, --stream, --compile/--model)
+lives in its own <tool>_<mode>.py and is imported only when selected.
+"""
+import sys, json
+
+def read_stdin():
+    return json.loads(sys.stdin.read())
+
+def option(argv, flag):
+    """Value following `flag` in argv, or None if the flag is absent."""
+    if flag not in argv: return None
+    i = argv.index(flag)
+    if i + 1 >= len(argv):
+        raise SystemExit(f"{flag} requires a value")
+    return argv[i+1]
@@ -0,0 +1,131 @@
+"""
+Whole-machine plans for the factory CLI (--integer).
+"""
+import math, time
+from collections import defaultdict, OrderedDict
+from branch_bound import branch_and_bound
+
+def run_integer(g, lp, mode="recipe", node_limit=10000, time_limit=1.5, maximize=False):
+    """Whole-machine plan via branch-and-bound (see branch_bound.py).
+
+    The min-machines LP (y fixed to 1) plus one whole count per recipe
+    (mode "recipe") or per machine type (mode "machine"). A count is the
+    machines its recipes run, sum x_r / eff_r, plus an idle column that
+    tops it up to a whole number, so it needs no linking row; machine caps
+    bound the counts. Minimizes the total count, or with maximize=True
+    finds the largest y <= 1 any whole-count plan reaches. Returns
+    (branch_and_bound result, groups, counts) where groups[k] = (name,
+    recipe indices) and counts(x) gives the whole counts of a solution.
+    """
+    A_eq, b_eq, A_ub, b_ub, y_idx, labels = lp
+    nrec = len(g.recipes)
+    if mode == "recipe":
+        groups = [(rname, [i]) for i, rname in enumerate(g.recipes)]
+    else:
+        by_machine = defaultdict(list)
+        for i in range(nrec):
+            by_machine[g.machine_of(i)].append(i)
+        groups = sorted(by_machine.items())
+    base = len(A_eq[0])
+    nvars = base + len(groups)
+    pad = [0.0]*len(groups)
+    exprs = []
+    for k, (_, rlist) in enumerate(groups):
+        coefs = {i: 1.0 / g.eff[i] for i in rlist}
+        coefs[base + k] = 1.0  # idle machines
+        exprs.append((coefs, base + k))
+
+    A_eq2 = [row + pad for row in A_eq]
+    b_eq2 = b_eq[:]
+    A_ub2 = [r + pad for r, (kind, _) in zip(A_ub, labels) if kind == "raw"]
+    b_ub2 = [b for b, (kind, _) in zip(b_ub, labels) if kind == "raw"]
+    row = [0.0]*nvars; row[y_idx] = 1.0
+    if maximize:
+        A_ub2.append(row); b_ub2.append(1.0)   # y <= 1
+    else:
+        A_eq2.append(row); b_eq2.append(1.0)   # y = 1
+
+    # machine caps bound the whole counts
+    counts_on = defaultdict(list)
+    for k, (_, rlist) in enumerate(groups):
+        counts_on[g.machine_of(rlist[0])].append(k)
+    for m, ks in sorted(counts_on.items()):
+        cap = float(g.machine_caps.get(m, float('inf')))
+        if math.isfinite(cap):
+            row = [0.0]*nvars
+            for k in ks:
+                for j, v in exprs[k][0].items():
+                    row[j] += v
+            A_ub2.append(row); b_ub2.append(cap)
+
+    c = [0.0]*nvars
+    if maximize:
+        c[y_idx] = -1.0
+    else:
+        for coefs, _ in exprs:
+            for j, v in coefs.items():
+                c[j] += v
+    res = branch_and_bound(c, A_eq2, b_eq2, A_ub2, b_ub2, exprs,
+                           node_limit=node_limit, time_limit=time_limit)
+    counts = lambda x: [int(round(sum(v*x[j] for j, v in coefs.items()))) for coefs, _ in exprs]
+    return res, groups, counts
+
+def integer_output(g, res, groups, counts, mode):
+    """The "ok" output for an integer plan; per_machine_counts are whole."""
+    x = res["x"]
+    nrec = len(g.recipes)
+    counts = counts(x)
+    per_recipe = OrderedDict((rname, float(x[i])) for i, rname in enumerate(g.recipes))
+    per_machine = defaultdict(int)
+    for k, (_, rlist) in enumerate(groups):
+        per_machine[g.machine_of(rlist[0])] += counts[k]
+    raw_use = OrderedDict((g.names[item], float(x[nrec+j])) for j, item in enumerate(g.raw))
+    info = OrderedDict([("mode", mode), ("search", res["status"]), ("nodes", res["nodes"]),
+                        ("total_machines", sum(counts)), ("best_bound", res["best_bound"]),
+                        ("gap", res["gap"])])
+    if mode == "recipe":
+        info["per_recipe_machines"] = OrderedDict((name, counts[k]) for k, (name, _) in enumerate(groups))
+    return {
+        "status":"ok",
+        "per_recipe_crafts_per_min": per_recipe,
+        "per_machine_counts": {k: per_machine[k] for k in sorted(per_machine.keys())},
+        "raw_consumption_per_min": raw_use,
+        "integer": info,
+    }
+
+def integer_plan(g, lp, mode, node_limit, time_limit):
+    """The --integer output (without "sensitivity") for RecipeGraph `g`."""
+    t0 = time.perf_counter()
+    res, groups, counts = run_integer(g, lp, mode, node_limit, time_limit)
+    info = {"mode": mode, "search": res["status"], "nodes": res["nodes"]}
+    if res["x"] is None and res["status"] != "infeasible":
+        # stopped before any whole-machine plan: the LP reaches the target,
+        # so nothing is proven either way and no rate is claimed
+        return {"status":"limit", "max_feasible_target_per_min": None,
+                "bottleneck_hint": ["integer search limit"], "integer": info}
+    if res["x"] is None:
+        # only machine caps can rule out whole counts (rounding up is
+        # otherwise free), so they are the hint unless the best
+        # whole-machine rate below narrows it to the caps it fills
+        caps = sorted(f"{m} cap" for m in g.machine_caps)
+        out = {"status":"infeasible", "max_feasible_target_per_min": 0.0,
+               "bottleneck_hint": caps, "integer": info}
+        left = time_limit - (time.perf_counter() - t0)
+        if left > 0:
+            best = run_integer(g, lp, mode, node_limit, left, maximize=True)[0]
+            hints = []
+            if best["x"] is not None:
+                out["max_feasible_target_per_min"] = best["x"][lp[4]]*g.target_rate
+                # capped machine types whose machines all run flat out
+                # (no fractional spare capacity left to grow into)
+                x = best["x"]
+                full = defaultdict(lambda: True)
+                for _, rlist in groups:
+                    busy = sum(x[i] / g.eff[i] for i in rlist)
+                    m = g.machine_of(rlist[0])
+                    full[m] = full[m] and abs(busy - round(busy)) <= 1e-6
+                hints = [f"{m} cap" for m in g.machine_caps if full[m]]
+            out["bottleneck_hint"] = sorted(hints) or caps
+    else:
+        out = integer_output(g, res, groups, counts, mode)
+    return out
@@ -0,0 +1,57 @@
+"""
+Compiled binary models for the factory CLI (--compile / --model); see
+binmodel.py.
+"""
+from array import array
+import binmodel
+
+def compile_model(inp, fp):
+    """Write `inp` as a compiled binary model (see binmodel.py) to `fp`.
+
+    Recipes are written in sorted-name order (the LP column order) and their
+    inputs/outputs CSR-style: recipe r owns entries in_ptr[r]:in_ptr[r+1] of
+    in_item/in_qty (likewise for outputs), so RecipeGraph.from_model can use
+    the mmapped arrays as is.
+    """
+    names = binmodel.Names()
+    ids = lambda seq: array("q", [names(x) for x in seq])
+    floats = lambda seq: array("d", [float(x) for x in seq])
+    recipes = {r: inp["recipes"][r] for r in sorted(inp["recipes"])}
+    sec = {"rec_name": ids(recipes),
+           "rec_mach": ids(r["machine"] for r in recipes.values()),
+           "rec_time": floats(r["time_s"] for r in recipes.values())}
+    for side in ("in", "out"):
+        ptr, item, qty = array("q", [0]), array("q"), array("d")
+        for r in recipes.values():
+            for k, v in r.get(side, {}).items():
+                item.append(names(k)); qty.append(float(v))
+            ptr.append(len(item))
+        sec[side + "_ptr"], sec[side + "_item"], sec[side + "_qty"] = ptr, item, qty
+    machines = inp["machines"]
+    modules = inp.get("modules", {})
+    limits = inp.get("limits", {})
+    raw_caps = limits.get("raw_supply_per_min", {})
+    max_m = limits.get("max_machines", {})
+    sec.update({
+        "mach": ids(machines), "mach_cpm": floats(m["crafts_per_min"] for m in machines.values()),
+        "mod_mach": ids(modules),
+        "mod_spd": floats(m.get("speed", 0.0) for m in modules.values()),
+        "mod_prod": floats(m.get("prod", 0.0) for m in modules.values()),
+        "raw_item": ids(raw_caps), "raw_cap": floats(raw_caps.values()),
+        "cap_mach": ids(max_m), "cap_val": floats(max_m.values()),
+        "target": ids([inp["target"]["item"]]), "rate": floats([inp["target"]["rate_per_min"]]),
+    })
+    binmodel.dump("fact", names, sec, fp)
+
+def graph_args(path):
+    """RecipeGraph(...) arguments for a compiled model; CSR arrays stay mmapped views."""
+    names, v = binmodel.load(path, "fact")
+    cpm = dict(zip(v["mach"], v["mach_cpm"]))
+    speed = dict(zip(v["mod_mach"], v["mod_spd"]))
+    prod = dict(zip(v["mod_mach"], v["mod_prod"]))
+    return (names, [names[i] for i in v["rec_name"]], v["rec_mach"], v["rec_time"],
+            cpm, speed, prod,
+            v["in_ptr"], v["in_item"], v["in_qty"], v["out_ptr"], v["out_item"], v["out_qty"],
+            names[v["target"][0]], v["rate"][0],
+            {names[i]: c for i, c in zip(v["raw_item"], v["raw_cap"])},
+            {names[i]: c for i, c in zip(v["cap_mach"], v["cap_val"])})
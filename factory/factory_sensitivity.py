@@ -0,0 +1,32 @@
+"""
+Cap and recipe sensitivity for the factory CLI (--sensitivity).
+"""
+import math
+from collections import OrderedDict
+
+def sensitivity_report(g, lp, sens):
+    """Cap shadow prices and recipe reduced costs from the max-rate basis.
+
+    Units are target items/min: a cap's shadow_price is the max target rate
+    gained per unit of extra cap, valid while the cap stays within
+    [cap - allowable_decrease, cap + allowable_increase] (null = unlimited);
+    a recipe's reduced cost is the max target rate lost per craft/min forced
+    through it (0 for recipes in the basis). With sens None (max rate
+    unbounded) no finite cap binds.
+    """
+    b_ub, labels = lp[3], lp[5]
+    rate = g.target_rate
+    report = {"raw_supply": OrderedDict(), "max_machines": OrderedDict(),
+              "recipe_reduced_costs": OrderedDict()}
+    bound = lambda v: float(v) if math.isfinite(v) else None
+    for i, (kind, name) in enumerate(labels):
+        if sens is None:
+            price, (dec, inc) = 0.0, (math.inf, math.inf)
+        else:
+            price, (dec, inc) = -sens["duals_ub"][i]*rate + 0.0, sens["ub_ranges"][i]
+        report["raw_supply" if kind == "raw" else "max_machines"][name] = {
+            "cap": b_ub[i], "shadow_price": price,
+            "allowable_increase": bound(inc), "allowable_decrease": bound(dec)}
+    for i, rname in enumerate(g.recipes):
+        report["recipe_reduced_costs"][rname] = 0.0 if sens is None else sens["reduced_costs"][i]*rate + 0.0
+    return report
@@ -0,0 +1,295 @@
+"""
+Factory planner: max-rate and min-machines LPs over a RecipeGraph.
+"""
+import sys, json, math
+from collections import defaultdict, OrderedDict
+from cli_common import read_stdin, option
+
+TOL = 1e-9
+
+class RecipeGraph:
+    """Recipe book compiled once per input and shared by every phase.
+
+    Item and machine names are ids into `names`; `recipes` holds recipe names
+    in sorted order, so recipe i is LP column i. Inputs/outputs are CSR:
+    recipe i owns in_ptr[i]:in_ptr[i+1] of in_item/in_qty (likewise out_*).
+    Effective rates and productivity factors are precomputed per recipe.
+    """
+    __slots__ = ("names", "recipes", "rec_machine", "eff", "prod",
+                 "in_ptr", "in_item", "in_qty", "out_ptr", "out_item", "out_qty",
+                 "raw", "intermediates", "target", "target_rate", "raw_caps", "machine_caps")
+
+    def __init__(self, names, recipes, rec_machine, rec_time, cpm, speed, prod,
+                 in_ptr, in_item, in_qty, out_ptr, out_item, out_qty,
+                 target, target_rate, raw_caps, machine_caps):
+        self.names, self.recipes, self.rec_machine = names, recipes, rec_machine
+        self.in_ptr, self.in_item, self.in_qty = in_ptr, in_item, in_qty
+        self.out_ptr, self.out_item, self.out_qty = out_ptr, out_item, out_qty
+        self.target, self.target_rate = target, float(target_rate)
+
+        # eff is stored with the 1e30 guard for non-positive rates applied,
+        # so machines = crafts / eff everywhere
+        self.eff, self.prod = [], []
+        for i, m in enumerate(rec_machine):
+            e = cpm[m] * (1.0 + speed.get(m, 0.0)) * 60.0 / float(rec_time[i])
+            self.eff.append(e if e > 0 else 1e30)
+            self.prod.append(1.0 + prod.get(m, 0.0))
+
+        produced, consumed = set(out_item), set(in_item)
+        self.raw = sorted(consumed - produced, key=names.__getitem__)
+        self.intermediates = sorted(produced, key=names.__getitem__)
+        self.raw_caps = [float(raw_caps.get(names[j], float('inf'))) for j in self.raw]
+        self.machine_caps = machine_caps
+
+    @classmethod
+    def from_input(cls, inp):
+        from array import array
+        names, index = [], {}
+        def intern(name):
+            i = index.get(name)
+            if i is None:
+                i = index[name] = len(names); names.append(name)
+            return i
+        machines = inp["machines"]
+        modules = inp.get("modules", {})
+        cpm = {intern(m): info["crafts_per_min"] for m, info in machines.items()}
+        speed = {intern(m): modules.get(m, {}).get("speed", 0.0) for m in machines}
+        prod = {intern(m): modules.get(m, {}).get("prod", 0.0) for m in machines}
+
+        recipes = inp["recipes"]
+        rnames = sorted(recipes)
+        rec_machine, rec_time = array("l"), array("d")
+        csr = {}
+        for side in ("in", "out"):
+            csr[side] = (array("l", [0]), array("l"), array("d"))
+        for rname in rnames:
+            r = recipes[rname]
+            rec_machine.append(intern(r["machine"])); rec_time.append(float(r["time_s"]))
+            for side, (ptr, item, qty) in csr.items():
+                for k, v in r.get(side, {}).items():
+                    item.append(intern(k)); qty.append(v)
+                ptr.append(len(item))
+
+        limits = inp.get("limits", {})
+        return cls(names, rnames, rec_machine, rec_time, cpm, speed, prod,
+                   *csr["in"], *csr["out"],
+                   inp["target"]["item"], inp["target"]["rate_per_min"],
+                   limits.get("raw_supply_per_min", {}), dict(limits.get("max_machines", {})))
+
+    @classmethod
+    def from_model(cls, path):
+        """Build from a compiled binary model (see factory_model.py)."""
+        from factory_model import graph_args
+        return cls(*graph_args(path))
+
+    def machine_of(self, i):
+        return self.names[self.rec_machine[i]]
+
+    def coefficients(self):
+        """Net output per craft: {item id: {recipe index: out*prod - in}}."""
+        coef = defaultdict(dict)
+        for i in range(len(self.recipes)):
+            p = self.prod[i]
+            for k in range(self.out_ptr[i], self.out_ptr[i+1]):
+                row = coef[self.out_item[k]]
+                row[i] = row.get(i, 0.0) + self.out_qty[k] * p
+            for k in range(self.in_ptr[i], self.in_ptr[i+1]):
+                row = coef[self.in_item[k]]
+                row[i] = row.get(i, 0.0) - self.in_qty[k]
+        return coef
+
+def build_balance_matrices(g):
+    coef = g.coefficients()
+    nrec = len(g.recipes)
+    idx_c_start = nrec
+    y_idx = idx_c_start + len(g.raw)
+    nvars = y_idx + 1
+
+    def balance_row(item):
+        row = [0.0]*nvars
+        for i, v in coef.get(item, {}).items():
+            row[i] = v
+        return row
+
+    A_eq = []
+    b_eq = []
+
+    # intermediates balance = 0 (exclude target)
+    for item in g.intermediates:
+        if g.names[item] == g.target:
+            continue
+        A_eq.append(balance_row(item))
+        b_eq.append(0.0)
+
+    # target balance = y * target_rate
+    target_ids = [j for j in coef if g.names[j] == g.target]
+    row = balance_row(target_ids[0]) if target_ids else [0.0]*nvars
+    row[y_idx] = -g.target_rate
+    A_eq.append(row)
+    b_eq.append(0.0)
+
+    # raw items: sum(out-in) + c_i = 0
+    for j, item in enumerate(g.raw):
+        row = balance_row(item)
+        row[idx_c_start + j] = 1.0
+        A_eq.append(row)
+        b_eq.append(0.0)
+
+    A_ub = []
+    b_ub = []
+    ub_labels = []  # ("raw", item) / ("machine", m) per A_ub row
+
+    # raw caps: c_i <= cap
+    for j, cap in enumerate(g.raw_caps):
+        if math.isfinite(cap):
+            row = [0.0]*nvars
+            row[idx_c_start + j] = 1.0
+            A_ub.append(row)
+            b_ub.append(cap)
+            ub_labels.append(("raw", g.names[g.raw[j]]))
+
+    # machine caps: sum x_r / eff_r <= max_machines[m]
+    by_machine = defaultdict(list)
+    for i in range(nrec):
+        by_machine[g.machine_of(i)].append(i)
+    for m, rlist in sorted(by_machine.items()):
+        cap = float(g.machine_caps.get(m, float('inf')))
+        if math.isfinite(cap):
+            row = [0.0]*nvars
+            for i in rlist:
+                row[i] = 1.0 / g.eff[i]
+            A_ub.append(row)
+            b_ub.append(cap)
+            ub_labels.append(("machine", m))
+
+    return (A_eq, b_eq, A_ub, b_ub, y_idx, ub_labels)
+
+# lp_solver is imported where it is used so --compile and other non-solving
+# paths do not pay for it; `lp` lets callers share one build_balance_matrices.
+def run_max_rate(g, lp=None):
+    """Maximize the target scale y; also returns the final-basis sensitivity."""
+    from lp_solver import simplex_minimize
+    A_eq, b_eq, A_ub, b_ub, y_idx, _ = lp or build_balance_matrices(g)
+    nvars = len(A_eq[0])
+    c = [0.0]*nvars
+    c[y_idx] = -1.0  # maximize y
+    status, x, obj, sens = simplex_minimize(c, A_eq, b_eq, A_ub, b_ub, sensitivity=True)
+    if status != "optimal":
+        return status, None, None, None
+    return "optimal", x, -obj, sens
+
+def run_min_machines(g, lp=None):
+    from lp_solver import simplex_minimize
+    A_eq, b_eq, A_ub, b_ub, y_idx, _ = lp or build_balance_matrices(g)
+    nvars = len(A_eq[0])
+    # add y <= 1 and -y <= -1
+    row1 = [0.0]*nvars; row1[y_idx] = 1.0
+    row2 = [0.0]*nvars; row2[y_idx] = -1.0
+    A_ub2 = A_ub + [row1, row2]
+    b_ub2 = b_ub + [1.0, -1.0]
+    c = [0.0]*nvars
+    for idx in range(len(g.recipes)):
+        c[idx] = 1.0 / g.eff[idx] + 1e-12*(idx+1)
+    status, x, obj = simplex_minimize(c, A_eq, b_eq, A_ub2, b_ub2)
+    return status, x, obj
+
+def bottleneck_hints(g, x):
+    """Caps that plan `x` (recipe crafts, then raw use) runs at."""
+    nrec = len(g.recipes)
+    hints = []
+    used = defaultdict(float)
+    for i in range(nrec):
+        used[g.machine_of(i)] += x[i] / g.eff[i]
+    for m, cap in g.machine_caps.items():
+        if used[m] >= cap - 1e-7:
+            hints.append(f"{m} cap")
+    for j, item in enumerate(g.raw):
+        c_i = x[nrec+j]
+        cap = g.raw_caps[j]
+        if math.isfinite(cap) and c_i >= cap - 1e-7:
+            hints.append(f"{g.names[item]} supply")
+    return sorted(list(dict.fromkeys(hints)))
+
+def factory_solve(g, argv=()):
+    """The output dict for RecipeGraph `g`; argv carries the mode flags."""
+    nrec = len(g.recipes)
+    want_sens = "--sensitivity" in argv
+    if not want_sens and g.target_rate > 0 and all(g.names[j] != g.target for j in g.intermediates):
+        # nothing makes the target: the max rate is 0 with every recipe idle,
+        # no LP needed
+        out = {"status":"infeasible", "max_feasible_target_per_min": 0.0,
+               "bottleneck_hint": bottleneck_hints(g, [0.0]*(nrec + len(g.raw)))}
+        return out
+
+    lp = build_balance_matrices(g)
+    status, x, maxy, sens = run_max_rate(g, lp)
+
+    if status == "unbounded":
+        maxy = math.inf  # no finite limit binds the target
+    elif status != "optimal":
+        out = {"status":"infeasible","max_feasible_target_per_min":0.0,"bottleneck_hint":["LP failed"]}
+        return out
+
+    if maxy < 1.0 - 1e-9:
+        out = {"status":"infeasible",
+               "max_feasible_target_per_min": maxy*g.target_rate,
+               "bottleneck_hint": bottleneck_hints(g, x)}
+        if want_sens:
+            from factory_sensitivity import sensitivity_report
+            out["sensitivity"] = sensitivity_report(g, lp, sens)
+        return out
+
+    if "--integer" in argv:
+        mode = option(argv, "--integer-mode") or "recipe"
+        if mode not in ("recipe", "machine"):
+            raise SystemExit("--integer-mode must be 'recipe' or 'machine'")
+        node_limit = int(option(argv, "--node-limit") or 10000)
+        time_limit = float(option(argv, "--time-limit") or 1.5)
+        from factory_integer import integer_plan
+        out = integer_plan(g, lp, mode, node_limit, time_limit)
+        if want_sens:
+            from factory_sensitivity import sensitivity_report
+            out["sensitivity"] = sensitivity_report(g, lp, sens)
+        return out
+
+    status2, x2, obj2 = run_min_machines(g, lp)
+    if status2 != "optimal":
+        x2 = x  # fallback feasible
+    if x2 is None:
+        out = {"status":"infeasible","max_feasible_target_per_min":0.0,"bottleneck_hint":["LP failed"]}
+        return out
+
+    per_recipe = OrderedDict()
+    per_machine = defaultdict(float)
+    raw_use = OrderedDict()
+
+    for i, rname in enumerate(g.recipes):
+        per_recipe[rname] = float(x2[i])
+        per_machine[g.machine_of(i)] += x2[i] / g.eff[i]
+
+    for j, item in enumerate(g.raw):
+        raw_use[g.names[item]] = float(x2[nrec+j])
+
+    out = {
+        "status":"ok",
+        "per_recipe_crafts_per_min": per_recipe,
+        "per_machine_counts": {k: float(per_machine[k]) for k in sorted(per_machine.keys())},
+        "raw_consumption_per_min": raw_use
+    }
+    if want_sens:
+        from factory_sensitivity import sensitivity_report
+        out["sensitivity"] = sensitivity_report(g, lp, sens)
+    return out
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if "--compile" in argv:
+        from factory_model import compile_model
+        compile_model(read_stdin(), sys.stdout.buffer)
+        return
+    model = option(argv, "--model")
+    g = RecipeGraph.from_model(model) if model is not None else RecipeGraph.from_input(read_stdin())
+    sys.stdout.write(json.dumps(factory_solve(g, argv), separators=(",",":")))
+
+if __name__ == "__main__":
+    main()
@@ -1,173 +1,419 @@
 """
 A tiny deterministic two-phase simplex LP solver.
 min c^T x  s.t.  A_eq x = b_eq,  A_ub x <= b_ub,  x >= 0
-Uses Bland's rule for anti-cycling. Small/medium LPs only.
+Dantzig pricing, with Bland's rule as the anti-cycling fallback on
+degenerate stalls. Infeasible/unbounded verdicts are checked against the
+original rows (the tableau is rebuilt from them where that is stable), so
+rounding drift cannot fake one. Small/medium LPs only.
 
 Returns: (status, x, obj) with status in {"optimal","infeasible","unbounded"}
+("limit" too when a deadline is given and passes first).
+With sensitivity=True a fourth element holds what the final tableau says
+about the optimum (None unless optimal):
+  duals_eq, duals_ub  d obj / d b_i for each constraint (shadow prices)
+  reduced_costs       c_j - y^T A_j for each variable
+  ub_ranges           (allowable decrease, allowable increase) of each b_ub[i]
+                      over which duals_ub stay valid (math.inf if unlimited)
+
+simplex_solve additionally returns the final tableau as an LPState, and
+resolve_with_bound re-optimizes it after tightening one variable's bound
+(dual simplex), which is how branch_bound warm-starts child LPs.
 """
-from typing import List, Tuple
-import math
+import math, time
 
 EPS = 1e-10
+STALL = 100      # degenerate pivots before falling back to Bland's rule
+FEAS_TOL = 1e-9  # row violation allowed, relative to the row's own terms
 
-def simplex_minimize(c, A_eq, b_eq, A_ub, b_ub):
-    import copy
-    m_eq = len(A_eq)
-    n = len(c)
-    m_ub = len(A_ub)
+class LPState:
+    """A simplex tableau with the data needed to rebuild it.
 
-    # Build Phase I tableau with artificial vars for equalities and slacks for <=
-    T_rows = []
-    rhs = []
+    Columns are x (n), slacks (m_ub), artificials (never enter again), then
+    one slack per bound added by resolve_with_bound; the last entry of every
+    row is the rhs and the last row is the objective. `cols` lists the
+    columns allowed to enter. rows0[i] = ({col: coef}, rhs, own) is row i as
+    first written (own: its slack/artificial column) and `cost` maps columns
+    to the current phase's objective; `since` counts pivots since the
+    tableau was last exact (built or rebuilt).
+    """
+    __slots__ = ("tableau", "basis", "n", "m_eq", "m_ub", "sgn", "art_col", "cols",
+                 "rows0", "cost", "since")
 
-    # equalities + artificials
-    for i in range(m_eq):
-        row = A_eq[i][:] + [0.0]*m_ub + [0.0]*m_eq
-        row[n + m_ub + i] = 1.0
-        T_rows.append(row)
-        rhs.append(b_eq[i])
+    def copy(self):
+        st = LPState()
+        st.tableau = [r[:] for r in self.tableau]
+        st.basis = self.basis[:]
+        st.n, st.m_eq, st.m_ub, st.sgn, st.art_col = self.n, self.m_eq, self.m_ub, self.sgn, self.art_col
+        st.cols = self.cols[:]
+        st.rows0, st.cost, st.since = self.rows0[:], self.cost, self.since  # rows0 entries are never mutated
+        return st
 
-    # inequalities + slacks
-    for i in range(m_ub):
-        row = A_ub[i][:] + [0.0]*m_ub + [0.0]*m_eq
-        row[n + i] = 1.0
-        T_rows.append(row)
-        rhs.append(b_ub[i])
+    def solution(self):
+        x = [0.0]*self.n
+        for i, b in enumerate(self.basis):
+            if b < self.n:
+                x[b] = self.tableau[i][-1]
+        for i in range(len(x)):
+            if -1e-9 < x[i] < 1e-9:  # rounding noise either side of zero
+                x[i] = 0.0
+        return x, -self.tableau[-1][-1]
 
-    var_total = n + m_ub + m_eq
-    m_total = len(T_rows)
+def _pivot(tableau, basis, col, row):
+    piv = tableau[row][col]
+    if abs(piv) < EPS: return False
+    inv = 1.0/piv
+    # normalize pivot row
+    prow = tableau[row]
+    for j in range(len(prow)):
+        prow[j] *= inv
+    # eliminate over the pivot row's nonzeros only; every nonzero factor is
+    # applied (a skipped 1e-11 times a 1e5 rhs is a visible error) and the
+    # pivot column is then set exactly
+    nz = [j for j, v in enumerate(prow) if v != 0.0]
+    for i in range(len(tableau)):
+        if i == row: continue
+        r = tableau[i]
+        factor = r[col]
+        if factor != 0.0:
+            for j in nz:
+                r[j] -= factor * prow[j]
+            r[col] = 0.0
+    prow[col] = 1.0
+    basis[row] = col
+    return True
 
-    # Phase I objective: minimize sum(artificials)
-    c1 = [0.0]*(n + m_ub) + [1.0]*m_eq
+def _objective(tableau, basis, cost, width):
+    """Objective row (`width` entries) for `cost` ({col: c}) reduced by the basis."""
+    obj_row = [0.0]*width
+    for j, v in cost.items():
+        obj_row[j] = v
+    for r, bvar in enumerate(basis):
+        coef = obj_row[bvar]
+        if abs(coef) > EPS:
+            rr = tableau[r]
+            for k, v in enumerate(rr):
+                if v != 0.0:
+                    obj_row[k] -= coef * v
+            obj_row[bvar] = 0.0
+    return obj_row
 
-    # Initial basis: artificials for eq rows; slacks for ub rows
-    basis = []
-    for i in range(m_eq):
-        basis.append(n + m_ub + i)
-    for i in range(m_ub):
-        basis.append(n + i)
-
-    # Build tableau with objective row reduced by current basis
-    def build_tableau(rows, rhs, obj):
-        A = [r[:] + [rhs_i] for r, rhs_i in zip(rows, rhs)]
-        obj_row = obj[:] + [0.0]
-        for r, bvar in enumerate(basis):
-            coef = obj_row[bvar]
-            if abs(coef) > EPS:
-                rr = A[r]
-                for k in range(len(obj_row)):
-                    obj_row[k] -= coef * rr[k]
-        A.append(obj_row)
-        return A
-
-    tableau = build_tableau(T_rows, rhs, c1)
-
-    def pivot(col, row):
-        piv = tableau[row][col]
-        if abs(piv) < EPS: return False
-        inv = 1.0/piv
-        # normalize pivot row
-        for j in range(len(tableau[row])):
-            tableau[row][j] *= inv
-        # eliminate
-        for i in range(len(tableau)):
-            if i == row: continue
-            factor = tableau[i][col]
-            if abs(factor) > EPS:
-                for j in range(len(tableau[i])):
-                    tableau[i][j] -= factor * tableau[row][j]
-        basis[row] = col
-        return True
-
-    def choose_entering():
+def _refactor(st):
+    """Rebuild st.tableau from rows0 for st.basis; False if that is unsafe.
+
+    Gauss-Jordan with partial pivoting over the basic columns. If some basic
+    column has no usable pivot left (an ill-conditioned basis) or the
+    rebuilt values are not primal feasible beyond rounding, st is left as
+    it was: swapping columns out would hand the primal simplex an
+    infeasible start. Tiny negative values are rounding and are zeroed.
+    """
+    width = len(st.tableau[-1])
+    T = []
+    for a, b, _ in st.rows0:
+        row = [0.0]*width
+        for j, v in a.items():
+            row[j] = v
+        row[-1] = b
+        T.append(row)
+    free = set(range(len(T)))
+    basis = [None]*len(T)
+    for col in st.basis:
+        best, row = 1e-9, None
+        for i in free:
+            v = abs(T[i][col])
+            if v > best:
+                best, row = v, i
+        if row is None:
+            return False
+        _pivot(T, basis, col, row)
+        free.discard(row)
+    # rhs i sums B^-1[i,k] * b_k and row i's own-column entries are B^-1[i,k],
+    # so that sum of magnitudes is the row's rounding scale
+    rhs = [(own, b / a[own]) for a, b, own in st.rows0 if b]
+    for r in T:
+        if r[-1] < -1e-9 * max(1.0, sum(abs(r[own] * w) for own, w in rhs)):
+            return False
+        if r[-1] < 0.0:
+            r[-1] = 0.0
+    T.append(_objective(T, basis, st.cost, width))
+    st.tableau, st.basis, st.since = T, basis, 0
+    return True
+
+def _fresh_row(st, r):
+    """Row r recomputed from rows0: its own-column entries are row r of B^-1."""
+    T = st.tableau
+    row = [0.0]*len(T[r])
+    for a, b, own in st.rows0:
+        w = T[r][own] / a[own]
+        if w != 0.0:
+            for j, v in a.items():
+                row[j] += w * v
+            row[-1] += w * b
+    for k, b in enumerate(st.basis):
+        row[b] = 1.0 if k == r else 0.0
+    return row
+
+def _rows_satisfied(st, n_struct):
+    """True if every artificial row holds at the current basic values.
+
+    Each row is judged against its own terms (a 1e9 cap elsewhere must not
+    excuse a violation of a row with rhs 1).
+    """
+    val = {b: st.tableau[i][-1] for i, b in enumerate(st.basis)}
+    for a, b, own in st.rows0:
+        if own < n_struct:
+            continue
+        terms = [v*val[j] for j, v in a.items() if j != own and j in val]
+        if abs(sum(terms) - b) > FEAS_TOL * max(1.0, abs(b), sum(map(abs, terms))):
+            return False
+    return True
+
+def _expired(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+def _primal(st, deadline=None):
+    """Primal simplex from a feasible basis: "optimal", "unbounded" or "limit".
+
+    Dantzig pricing with ratio-test ties going to the largest pivot (stable
+    on the heavily degenerate balance rows); after STALL pivots without
+    objective progress it switches to Bland's rule until progress resumes,
+    still skipping tied pivots far smaller than the largest. An apparent
+    ray is rechecked on a rebuilt tableau when the rebuild is safe.
+    """
+    stall = 0
+    while True:
+        if _expired(deadline):
+            return "limit"
+        tableau, basis = st.tableau, st.basis
         last = tableau[-1]
-        for j in range(len(last)-1):
-            if last[j] < -1e-12:  # negative reduced cost -> enter (min)
-                return j
-        return None
+        bland = stall > STALL
+        cands = [j for j in st.cols if last[j] < -1e-12]  # negative reduced cost -> enter (min)
+        if not bland:
+            cands.sort(key=last.__getitem__)
+        row = None
+        ray = False
+        for col in cands:
+            best = None
+            ties = []
+            for i in range(len(tableau)-1):
+                a = tableau[i][col]
+                if a > 1e-9:  # at least the pivot tolerance, so noise never pivots
+                    ratio = tableau[i][-1] / a
+                    if best is None or ratio < best - 1e-12:
+                        best, ties = ratio, [i]
+                    elif abs(ratio - best) <= 1e-12:
+                        ties.append(i)
+            if ties:
+                big = max(tableau[i][col] for i in ties)
+                if bland:
+                    # smallest basis index, among pivots not tiny next to the largest
+                    row = min((i for i in ties if tableau[i][col] >= 1e-2 * big), key=basis.__getitem__)
+                else:
+                    row = next(i for i in ties if tableau[i][col] == big)
+                break
+            if last[col] < -1e-9:
+                ray = True
+                break
+            # noise-level reduced cost with no pivot: not a real ray, skip it
+        if row is None:
+            if ray and st.since and _refactor(st):
+                continue  # confirm the ray on the rebuilt tableau
+            return "unbounded" if ray else "optimal"
+        before = last[-1]
+        _pivot(tableau, basis, col, row)
+        st.since += 1
+        stall = stall + 1 if abs(tableau[-1][-1] - before) <= 1e-12 * (1.0 + abs(before)) else 0
 
-    def choose_leaving(col):
-        best = None
-        best_row = None
-        for i in range(len(tableau)-1):
-            a = tableau[i][col]
-            if a > 1e-12:
-                ratio = tableau[i][-1] / a
-                if ratio < -1e-12:  # skip negative rhs
-                    continue
-                if (best is None) or (ratio < best - 1e-12) or (abs(ratio - best) <= 1e-12 and basis[i] > basis[best_row]):
-                    best = ratio
-                    best_row = i
-        return best_row
-
-    # Phase I
+def _dual(st, deadline=None):
+    """Dual simplex from a dual-feasible basis: "optimal", "infeasible" or "limit".
+
+    Most infeasible row leaves and ratio ties go to the largest pivot;
+    Bland's rule (again skipping tiny tied pivots) takes over after STALL
+    pivots without progress. An infeasible row is recomputed from the
+    original rows before it is believed.
+    """
+    stall = 0
     while True:
-        col = choose_entering()
-        if col is None:
-            break
-        row = choose_leaving(col)
+        if _expired(deadline):
+            return "limit"
+        tableau, basis = st.tableau, st.basis
+        bland = stall > STALL
+        row = None
+        for i in range(len(tableau)-1):
+            v = tableau[i][-1]
+            if v < -1e-9 and (row is None or ((basis[i] < basis[row]) if bland else (v < tableau[row][-1]))):
+                row = i
         if row is None:
-            return ("unbounded", None, None)
-        pivot(col, row)
-
-    if tableau[-1][-1] > 1e-8:
-        return ("infeasible", None, None)
-
-    # Phase II: rebuild constraints without artificials
-    # Reconstruct original constraints (same order)
-    T_rows2 = []
-    rhs2 = []
-    for i in range(m_eq):
-        T_rows2.append(A_eq[i][:] + [0.0]*m_ub)
-        rhs2.append(b_eq[i])
-    for i in range(m_ub):
-        row = A_ub[i][:] + [0.0]*m_ub
-        row[n + i] = 1.0
-        T_rows2.append(row)
-        rhs2.append(b_ub[i])
-
-    # New basis: slacks for ub rows; unknown for eq rows
-    basis = [None]*m_eq + [n+i for i in range(m_ub)]
-
-    tableau = [r[:] + [rhs2[i]] for i, r in enumerate(T_rows2)]
-    c2 = c[:] + [0.0]*m_ub
-    obj_row = c2[:] + [0.0]
-    for r, bvar in enumerate(basis):
-        if bvar is not None:
-            coef = obj_row[bvar]
-            if abs(coef) > EPS:
-                rr = tableau[r]
-                for k in range(len(obj_row)):
-                    obj_row[k] -= coef * rr[k]
-    tableau.append(obj_row)
-
-    # drive unknown eq rows to a basis
-    for i in range(len(basis)):
-        if basis[i] is None:
-            for j in range(n+m_ub):
-                if (j not in basis) and abs(tableau[i][j]) > 1e-9:
-                    pivot(j, i)
-                    break
+            return "optimal"
+        r = tableau[row]
+        last = tableau[-1]
+        best = None
+        ties = []
+        for j in st.cols:
+            a = r[j]
+            if a < -1e-9:
+                ratio = max(last[j], 0.0) / -a
+                if best is None or ratio < best - 1e-12:
+                    best, ties = ratio, [j]
+                elif abs(ratio - best) <= 1e-12:
+                    ties.append(j)
+        if not ties:
+            fresh = _fresh_row(st, row)
+            if fresh[-1] < -1e-9 and all(fresh[j] >= -1e-9 for j in st.cols):
+                return "infeasible"
+            tableau[row] = fresh  # drifted: retry from the recomputed row
+            continue
+        big = min(r[j] for j in ties)
+        if bland:
+            col = next(j for j in ties if r[j] <= 1e-2 * big)
+        else:
+            col = next(j for j in ties if r[j] == big)
+        before = last[-1]
+        _pivot(tableau, basis, col, row)
+        st.since += 1
+        stall = stall + 1 if abs(tableau[-1][-1] - before) <= 1e-12 * (1.0 + abs(before)) else 0
+
+def simplex_solve(c, A_eq, b_eq, A_ub, b_ub, deadline=None):
+    """Like simplex_minimize but returns (status, x, obj, LPState or None).
 
-    # Phase II simplex
+    `deadline` is a time.perf_counter() value; past it the status is "limit".
+    """
+    m_eq = len(A_eq)
+    n = len(c)
+    m_ub = len(A_ub)
+
+    # Rows with a negative rhs are negated (sgn = -1) so the start is feasible.
+    # Equalities and negated inequalities get an artificial; other
+    # inequalities start with their slack basic.
+    rows = [(A_eq[i], b_eq[i], None) for i in range(m_eq)] + [(A_ub[i], b_ub[i], i) for i in range(m_ub)]
+    sgn = [-1.0 if b < 0 else 1.0 for _, b, _ in rows]
+    art_rows = [r for r, (_, _, ub) in enumerate(rows) if ub is None or sgn[r] < 0]
+    art_col = {r: n + m_ub + k for k, r in enumerate(art_rows)}
+    n_struct = n + m_ub                 # artificials (cols >= n_struct) never enter
+    width = n_struct + len(art_rows)
+
+    tableau = []
+    basis = []
+    rows0 = []
+    for r, (a, b, ub) in enumerate(rows):
+        s = sgn[r]
+        coefs = {j: s*v for j, v in enumerate(a) if v}
+        if ub is not None:
+            coefs[n + ub] = s
+        own = art_col[r] if r in art_col else n + ub
+        if r in art_col:
+            coefs[own] = 1.0
+        row = [0.0]*(width + 1)
+        for j, v in coefs.items():
+            row[j] = v
+        row[-1] = s*b
+        tableau.append(row)
+        basis.append(own)
+        rows0.append((coefs, s*b, own))
+
+    st = LPState()
+    st.tableau, st.basis, st.n, st.m_eq, st.m_ub = tableau, basis, n, m_eq, m_ub
+    st.sgn, st.art_col, st.cols = sgn, art_col, list(range(n_struct))
+    st.rows0, st.since = rows0, 0
+
+    # Phase I: minimize sum(artificials)
+    st.cost = {j: 1.0 for j in art_col.values()}
+    tableau.append(_objective(tableau, basis, st.cost, width + 1))
+    # judge feasibility by the rows themselves, not the objective cell,
+    # which only tracks the artificials up to rounding; a violation is
+    # rechecked on a rebuilt tableau when the rebuild is safe
     while True:
-        col = choose_entering()
-        if col is None:
+        status = _primal(st, deadline)
+        if status != "optimal":
+            return (status, None, None, None)
+        if _rows_satisfied(st, n_struct):
             break
-        row = choose_leaving(col)
-        if row is None:
-            return ("unbounded", None, None)
-        pivot(col, row)
-
-    # extract solution
-    var_total = n + m_ub
-    x = [0.0]*var_total
-    for i in range(len(basis)):
-        b = basis[i]
-        if b is not None and b < var_total:
-            x[b] = tableau[i][-1]
-    obj = tableau[-1][-1]
-    for i in range(len(x)):
-        if -1e-9 < x[i] < 0:
-            x[i] = 0.0
-    return ("optimal", x[:n], obj)
+        if not (st.since and _refactor(st)):
+            return ("infeasible", None, None, None)
+
+    # Pivot zero-level artificials out of the basis; a row with no structural
+    # entry left is redundant and keeps its artificial basic at zero.
+    tableau, basis = st.tableau, st.basis
+    for r in range(len(basis)):
+        if basis[r] >= n_struct:
+            for j in range(n_struct):
+                if abs(tableau[r][j]) > 1e-9:
+                    _pivot(tableau, basis, j, r)
+                    st.since += 1
+                    break
+
+    # Phase II continues from the Phase I basis
+    st.cost = {j: float(v) for j, v in enumerate(c) if v}
+    tableau[-1] = _objective(tableau, basis, st.cost, width + 1)
+    status = _primal(st, deadline)
+    if status != "optimal":
+        return (status, None, None, None)
+    x, obj = st.solution()
+    return ("optimal", x, obj, st)
+
+def resolve_with_bound(state, j, lo=None, hi=None, deadline=None):
+    """Re-optimize a copy of `state` with x_j >= lo or x_j <= hi added.
+
+    j may also be a {col: coef} dict, bounding sum(coef * x_col) instead.
+    The bound becomes a new row with its own slack, expressed in the current
+    basis; the parent basis stays dual feasible, so the dual simplex usually
+    needs only a few pivots. Returns (status, x, obj, LPState or None).
+    """
+    st = state.copy()
+    T = st.tableau
+    for r in T:
+        r.insert(len(r)-1, 0.0)
+    s_col = len(T[0]) - 2
+    row = [0.0]*len(T[0])
+    # x_j + s = hi   or   -x_j + s = -lo
+    sign, bound = (1.0, hi) if hi is not None else (-1.0, -lo)
+    coefs = {k: sign*v for k, v in (j.items() if isinstance(j, dict) else [(j, 1.0)])}
+    coefs[s_col] = 1.0
+    for k, v in coefs.items():
+        row[k] = v
+    row[-1] = bound
+    st.rows0.append((coefs, bound, s_col))
+    for i, b in enumerate(st.basis):
+        coef = row[b]
+        if coef != 0.0:
+            for k, v in enumerate(T[i]):
+                if v != 0.0:
+                    row[k] -= coef * v
+            row[b] = 0.0
+    T.insert(len(T)-1, row)
+    st.basis.append(s_col)
+    st.cols.append(s_col)
+    status = _dual(st, deadline)
+    if status == "optimal":
+        status = _primal(st, deadline)
+    if status != "optimal":
+        return (status, None, None, None)
+    x, obj = st.solution()
+    return ("optimal", x, obj, st)
+
+def tableau_sensitivity(state):
+    """Duals, reduced costs and b_ub ranges of an LPState (see module doc)."""
+    T = state.tableau
+    n = state.n
+    d = T[-1]
+    duals_eq = [-state.sgn[r]*d[state.art_col[r]] for r in range(state.m_eq)]
+    duals_ub = [-d[n + i] for i in range(state.m_ub)]
+    ub_ranges = []
+    for i in range(state.m_ub):
+        # rhs change delta moves basic values by delta * (slack column)
+        col = n + i
+        dec = inc = math.inf
+        for k in range(len(T)-1):
+            a = T[k][col]
+            if a > EPS:
+                dec = min(dec, T[k][-1] / a)
+            elif a < -EPS:
+                inc = min(inc, T[k][-1] / -a)
+        ub_ranges.append((max(dec, 0.0), max(inc, 0.0)))
+    return {"duals_eq": duals_eq, "duals_ub": duals_ub,
+            "reduced_costs": d[:n], "ub_ranges": ub_ranges}
+
+def simplex_minimize(c, A_eq, b_eq, A_ub, b_ub, sensitivity=False):
+    status, x, obj, st = simplex_solve(c, A_eq, b_eq, A_ub, b_ub)
+    if not sensitivity:
+        return (status, x, obj)
+    return (status, x, obj, tableau_sensitivity(st) if st is not None else None)